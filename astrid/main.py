@@ -5,13 +5,24 @@ from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from typing import Deque, Dict, Any, Callable, Iterable, Optional, Set, Tuple
 import asyncio
+import logging
+from collections import deque
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from datetime import datetime, timedelta
-import random
+from random import choice
+import re
+import time
 import importlib.resources as resources
 from pathlib import Path
 
+import orjson
+
+
+logger = logging.getLogger(__name__)
+
 
 # Resolve packaged asset directories
 pkg_root = resources.files(__package__)
@@ -45,113 +56,190 @@ class HudState(BaseModel):
 
 STATE = HudState()
 
+# Encoded {"type": "state"} frame shared by every client; reset whenever STATE changes
+_state_cache: Optional[str] = None
+
+
+def _state_payload() -> str:
+    global _state_cache
+    if _state_cache is None:
+        _state_cache = orjson.dumps({"type": "state", "data": STATE.model_dump()}).decode()
+    return _state_cache
+
+
+def _invalidate_state() -> None:
+    global _state_cache
+    _state_cache = None
+
+
+# Intent keywords in priority order: when a message hits several groups the first one wins
+_INTENTS = (
+    ("greeting", 0.9, ("hello", "hi", "hey", "greetings")),
+    ("status", 0.8, ("status", "how", "what", "condition", "state")),
+    ("power", 0.85, ("power", "electricity", "watt", "consumption", "generation")),
+    ("battery", 0.9, ("battery", "capacity", "charge", "energy", "storage")),
+    ("water", 0.7, ("water", "reserve", "level", "tank")),
+    ("maintenance", 0.8, ("maintenance", "service", "check", "inspect")),
+)
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex for any of ``words``, factored into a prefix trie.
+
+    Each position branches on the next character instead of trying every keyword in turn,
+    so scan cost stays flat as the vocabulary grows. The longest keyword at a position wins.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def render(node: Dict[str, dict]) -> str:
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        alt = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # A keyword ends here, so the longer ones below are optional
+            alt = (alt if len(branches) > 1 else "(?:" + alt + ")") + "?"
+        return alt
+
+    return render(trie)
+
+
+def _keyword_ranks() -> Dict[str, int]:
+    own: Dict[str, int] = {}
+    for rank, (_, _, words) in enumerate(_INTENTS):
+        for word in words:
+            own.setdefault(word, rank)
+    # The trie reports only the longest keyword at a position; any keywords that are its
+    # prefixes matched there too, so fold their priority in
+    return {
+        word: min(own[word[:n]] for n in range(1, len(word) + 1) if word[:n] in own)
+        for word in own
+    }
+
+
+# Best intent priority for each keyword, as matched by _INTENT_RE
+_KEYWORD_RANK = _keyword_ranks()
+
+# Wrapped in a lookahead so overlapping keywords are all reported. Keywords must start a
+# word ("hi" should not fire inside "this"); trailing text is allowed so plurals like
+# "watts" and "levels" still match. Case folding is ASCII-only inside the trie: Unicode
+# IGNORECASE would let "ſtatus" or "hı" match, and their .lower() isn't a _KEYWORD_RANK key.
+# \b stays Unicode-aware so "éhi" or "søhow" don't count as starting a keyword.
+_INTENT_RE = re.compile(
+    r"(?=\b((?a:" + _trie_pattern(_KEYWORD_RANK) + ")))", re.IGNORECASE
+)
+
+
+def _scan_intent(message: str) -> Tuple[str, float]:
+    """Return ``(intent, confidence)`` for a message."""
+    # Every keyword hit in one case-insensitive scan; the highest-priority intent wins
+    best = None
+    for match in _INTENT_RE.finditer(message):
+        rank = _KEYWORD_RANK[match.group(1).lower()]
+        if best is None or rank < best:
+            best = rank
+            if rank == 0:
+                break
+
+    if best is None:
+        return "unknown", 0.3
+    intent, confidence, _ = _INTENTS[best]
+    return intent, confidence
+
+
+# Only messages up to this length are memoized, so the cache can't pin large payloads
+_CLASSIFY_CACHE_MAX_LEN = 256
+
+_cached_scan_intent = lru_cache(maxsize=512)(_scan_intent)
+
+
+def _classify(message: str) -> Tuple[str, float]:
+    """Classify a message; short ones (typical chat input) hit the LRU cache on repeats."""
+    if len(message) <= _CLASSIFY_CACHE_MAX_LEN:
+        return _cached_scan_intent(message)
+    return _scan_intent(message)
+
+
+# Canned replies per intent, shared by every controller
+_RESPONSE_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "greeting": (
+        "Greetings, human. How may I assist you today?",
+        "Hello there. What would you like to know about your systems?",
+        "ASTRID online and ready. What's your query?",
+    ),
+    "status": (
+        "Current system status: All systems operational.",
+        "Status check complete. Everything is running within normal parameters.",
+        "Systems are functioning at optimal levels.",
+    ),
+    "unknown": (
+        "I'm not sure I understand that query. Could you rephrase?",
+        "That's outside my current knowledge base. Try asking about power, battery, or system status.",
+        "I need more context to help you with that request.",
+    ),
+}
+
+# Replies built from STATE readings, called as (load_w, sun_w, battery_pct); written as
+# f-strings so nothing re-parses a format string per message
+_STATE_TEMPLATES: Dict[str, Tuple[Callable[[int, int, int], str], ...]] = {
+    "power": (
+        lambda load_w, sun_w, battery_pct: f"Power consumption is currently at {load_w}W with {sun_w}W solar generation.",
+        lambda load_w, sun_w, battery_pct: f"Your power grid shows {load_w}W load against {sun_w}W solar input.",
+        lambda load_w, sun_w, battery_pct: f"Power status: {battery_pct}% battery, {load_w}W consumption, {sun_w}W generation.",
+    ),
+    "battery": (
+        lambda load_w, sun_w, battery_pct: f"Battery capacity is at {battery_pct}%.",
+        lambda load_w, sun_w, battery_pct: f"Your energy storage shows {battery_pct}% remaining.",
+        lambda load_w, sun_w, battery_pct: f"Battery status: {battery_pct}% capacity available.",
+    ),
+}
+
 
 class StatefulController:
     """A stateful controller that maintains conversation context and intelligently responds to user input."""
 
     def __init__(self):
-        self.conversation_history = []
+        # Keep only last 20 exchanges
+        self.conversation_history: deque = deque(maxlen=20)
         self.user_preferences = {}
         self.system_status = {
             "last_maintenance": datetime.now() - timedelta(days=7),
             "alerts": [],
             "mode": "normal",
         }
-        self.response_patterns = {
-            "greeting": [
-                "Greetings, human. How may I assist you today?",
-                "Hello there. What would you like to know about your systems?",
-                "ASTRID online and ready. What's your query?",
-            ],
-            "status": [
-                "Current system status: All systems operational.",
-                "Status check complete. Everything is running within normal parameters.",
-                "Systems are functioning at optimal levels.",
-            ],
-            "power": [
-                "Power consumption is currently at {load_w}W with {sun_w}W solar generation.",
-                "Your power grid shows {load_w}W load against {sun_w}W solar input.",
-                "Power status: {battery_pct}% battery, {load_w}W consumption, {sun_w}W generation.",
-            ],
-            "battery": [
-                "Battery capacity is at {battery_pct}%.",
-                "Your energy storage shows {battery_pct}% remaining.",
-                "Battery status: {battery_pct}% capacity available.",
-            ],
-            "unknown": [
-                "I'm not sure I understand that query. Could you rephrase?",
-                "That's outside my current knowledge base. Try asking about power, battery, or system status.",
-                "I need more context to help you with that request.",
-            ],
-        }
+        self.response_patterns = _RESPONSE_PATTERNS
 
     def add_to_history(self, user_message: str, bot_response: str):
         """Add a message exchange to conversation history."""
+        # Raw epoch nanoseconds; converted to a datetime only when the history is read
         self.conversation_history.append(
-            {"timestamp": datetime.now(), "user": user_message, "bot": bot_response}
+            {"timestamp": time.time_ns(), "user": user_message, "bot": bot_response}
         )
-        # Keep only last 20 exchanges
-        if len(self.conversation_history) > 20:
-            self.conversation_history.pop(0)
 
     def analyze_message(self, message: str) -> Dict[str, Any]:
         """Analyze user message to determine intent and extract relevant information."""
-        message_lower = message.lower().strip()
-
-        # Check for greetings
-        if any(word in message_lower for word in ["hello", "hi", "hey", "greetings"]):
-            return {"intent": "greeting", "confidence": 0.9}
-
-        # Check for status queries
-        if any(word in message_lower for word in ["status", "how", "what", "condition", "state"]):
-            return {"intent": "status", "confidence": 0.8}
-
-        # Check for power-related queries
-        if any(
-            word in message_lower for word in ["power", "electricity", "watt", "consumption", "generation"]
-        ):
-            return {"intent": "power", "confidence": 0.85}
-
-        # Check for battery queries
-        if any(
-            word in message_lower for word in ["battery", "capacity", "charge", "energy", "storage"]
-        ):
-            return {"intent": "battery", "confidence": 0.9}
-
-        # Check for water-related queries (from original message)
-        if any(word in message_lower for word in ["water", "reserve", "level", "tank"]):
-            return {"intent": "water", "confidence": 0.7}
-
-        # Check for maintenance queries
-        if any(word in message_lower for word in ["maintenance", "service", "check", "inspect"]):
-            return {"intent": "maintenance", "confidence": 0.8}
-
-        return {"intent": "unknown", "confidence": 0.3}
+        intent, confidence = _classify(message)
+        return {"intent": intent, "confidence": confidence}
 
     def generate_response(self, message: str, intent: str) -> str:
         """Generate an appropriate response based on intent and current state."""
-        if intent == "greeting":
-            return random.choice(self.response_patterns["greeting"])
-
-        elif intent == "status":
-            return random.choice(self.response_patterns["status"])
-
-        elif intent == "power":
-            template = random.choice(self.response_patterns["power"])
-            return template.format(
-                load_w=int(STATE.load_w),
-                sun_w=int(STATE.sun_w),
-                battery_pct=int(STATE.battery_pct),
-            )
+        renderers = _STATE_TEMPLATES.get(intent)
+        if renderers is not None:
+            return choice(renderers)(int(STATE.load_w), int(STATE.sun_w), int(STATE.battery_pct))
 
-        elif intent == "battery":
-            template = random.choice(self.response_patterns["battery"])
-            return template.format(battery_pct=int(STATE.battery_pct))
+        patterns = self.response_patterns.get(intent)
+        if patterns is not None:
+            return choice(patterns)
 
-        elif intent == "water":
+        if intent == "water":
             return "I don't have access to water system sensors at the moment. My current monitoring is limited to power systems."
 
-        elif intent == "maintenance":
+        if intent == "maintenance":
             days_since = (datetime.now() - self.system_status["last_maintenance"]).days
             if days_since > 30:
                 return f"System maintenance is overdue by {days_since - 30} days. Recommend scheduling a service check."
@@ -159,11 +247,10 @@ class StatefulController:
                 days_until = 30 - days_since
                 return f"Last maintenance was {days_since} days ago. Next scheduled maintenance in {days_until} days."
 
-        else:
-            return random.choice(self.response_patterns["unknown"])
+        return choice(self.response_patterns["unknown"])
 
-    def process_message(self, message: str) -> str:
-        """Process a user message and return an appropriate response."""
+    def process_message(self, message: str) -> Tuple[str, Dict[str, Any]]:
+        """Process a user message and return the response together with its intent analysis."""
         # Analyze the message
         analysis = self.analyze_message(message)
         intent = analysis["intent"]
@@ -174,38 +261,117 @@ class StatefulController:
         # Add to history
         self.add_to_history(message, response)
 
-        return response
+        return response, analysis
 
 
 # Initialize the stateful controller
 controller = StatefulController()
 
 
+# Clients enqueued to per batch before yielding back to the event loop
+BROADCAST_BATCH_SIZE = 50
+
+# Chat frames buffered per client; a client this far behind starts losing chat frames
+CLIENT_QUEUE_SIZE = 8
+
+# Frames with no variable content are encoded once at import
+_CLEAR_CENTER_FRAME = orjson.dumps({"type": "clear_center"}).decode()
+
+# Fanned out in place of a state frame; marks the client's state as pending, and the writer
+# sends whatever the state is when it gets to it
+_STATE_FRAME = object()
+
+# Broadcast topics: "state" carries HUD state frames, "chat" carries user_line, clear_center
+# and bot_reply. Clients pick theirs with /ws?topics=state,chat and get all of them by default.
+TOPICS = ("state", "chat")
+
+
+class _Client:
+    """Outbound side of one connection, drained by its own writer task.
+
+    Chat frames wait in a bounded FIFO. State is a single pending flag kept outside it, since a
+    newer state supersedes an unsent one and must never cost the client a bot reply.
+    """
+
+    def __init__(self) -> None:
+        self.frames: Deque[str] = deque()
+        self.state_pending = False
+        self.wakeup = asyncio.Event()
+        self.writer: Optional[asyncio.Task] = None
+
+
 class ConnectionManager:
     def __init__(self) -> None:
-        self.active: List[WebSocket] = []
+        self.active: Dict[WebSocket, _Client] = {}
+        self.subscribers: Dict[str, Dict[WebSocket, _Client]] = {topic: {} for topic in TOPICS}
 
-    async def connect(self, ws: WebSocket):
+    async def connect(self, ws: WebSocket, topics: Iterable[str] = TOPICS):
         await ws.accept()
-        self.active.append(ws)
-        await self.send_state(ws)
+        client = _Client()
+        client.writer = asyncio.create_task(self._write(ws, client))
+        self.active[ws] = client
+        for topic in topics:
+            self.subscribers[topic][ws] = client
+        if ws in self.subscribers["state"]:
+            self.send_state(ws)
 
     def disconnect(self, ws: WebSocket):
-        if ws in self.active:
-            self.active.remove(ws)
+        client = self.active.pop(ws, None)
+        if client is not None:
+            for subscribers in self.subscribers.values():
+                subscribers.pop(ws, None)
+            client.writer.cancel()
+
+    async def _write(self, ws: WebSocket, client: _Client):
+        # All sends for a socket go through here, so a slow client only backs up its own queue
+        try:
+            while True:
+                await client.wakeup.wait()
+                client.wakeup.clear()
+                while client.state_pending or client.frames:
+                    if client.state_pending:
+                        client.state_pending = False
+                        await ws.send_text(_state_payload())
+                    else:
+                        await ws.send_text(client.frames.popleft())
+        except Exception as e:
+            logger.warning("WebSocket send failed, dropping client: %s", e)
+            self.disconnect(ws)
+
+    def _enqueue(self, client: _Client, frame: Any):
+        if frame is _STATE_FRAME:
+            client.state_pending = True
+        elif len(client.frames) >= CLIENT_QUEUE_SIZE:
+            # Client isn't keeping up; it misses this frame rather than stalling the others
+            logger.warning("Client send queue full, dropping frame: %.80s", frame)
+            return
+        else:
+            client.frames.append(frame)
+        client.wakeup.set()
 
-    async def broadcast(self, message: Dict[str, Any]):
-        living = []
-        for ws in self.active:
-            try:
-                await ws.send_json(message)
-                living.append(ws)
-            except Exception:
-                pass
-        self.active = living
+    async def broadcast(self, topic: str, message: Dict[str, Any]):
+        # Encode once; every subscriber queues the same frame
+        await self.broadcast_raw(topic, orjson.dumps(message).decode())
+
+    async def broadcast_raw(self, topic: str, payload: str):
+        await self._fan_out(topic, payload)
 
-    async def send_state(self, ws: WebSocket):
-        await ws.send_json({"type": "state", "data": STATE.dict()})
+    async def broadcast_state(self):
+        await self._fan_out("state", _STATE_FRAME)
+
+    async def _fan_out(self, topic: str, frame: Any):
+        targets = list(self.subscribers[topic].values())
+        for start in range(0, len(targets), BROADCAST_BATCH_SIZE):
+            if start:
+                # Yield between batches so HTTP requests and the writers get a turn
+                await asyncio.sleep(0)
+            for client in targets[start:start + BROADCAST_BATCH_SIZE]:
+                self._enqueue(client, frame)
+
+    def send_state(self, ws: WebSocket):
+        client = self.active.get(ws)
+        if client is not None:
+            self._enqueue(client, _STATE_FRAME)
 
 
 manager = ConnectionManager()
@@ -216,58 +382,93 @@ async def index(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
+# The test page is static, so read it once at import rather than on every request
+try:
+    _TEST_HTML: Optional[bytes] = (Path(templates_dir) / "gui_test.html").read_bytes()
+except FileNotFoundError:
+    _TEST_HTML = None
+
+
 @app.get("/test", response_class=HTMLResponse)
 async def test_websocket(request: Request):
     # Use packaged example template for test page
-    test_path = Path(templates_dir) / "gui_test.html"
-    if test_path.exists():
-        content = test_path.read_text(encoding="utf-8")
-        return HTMLResponse(content=content)
+    if _TEST_HTML is not None:
+        return HTMLResponse(content=_TEST_HTML)
     return HTMLResponse(content="<h1>Test page not found</h1>", status_code=404)
 
 
+# Strong references so in-flight reply tasks aren't garbage collected mid-sleep
+_pending_replies: Set[asyncio.Task] = set()
+
+
+async def _deliver_reply(delay: float, text: str):
+    await asyncio.sleep(delay)
+    await manager.broadcast("chat", {"type": "bot_reply", "text": text})
+    logger.debug("Bot reply sent to %d clients", len(manager.subscribers["chat"]))
+
+
+def _parse_topics(raw: Optional[str]) -> Tuple[str, ...]:
+    """Known topics from a comma-separated ``?topics=`` value; all topics if none are given."""
+    if not raw:
+        return TOPICS
+    topics = tuple(topic for topic in TOPICS if topic in {part.strip() for part in raw.split(",")})
+    return topics or TOPICS
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(ws: WebSocket):
-    print(f"WebSocket connection attempt from {ws.client.host}:{ws.client.port}")
-    await manager.connect(ws)
-    print(f"WebSocket connected successfully. Total connections: {len(manager.active)}")
+    logger.info("WebSocket connection attempt from %s:%s", ws.client.host, ws.client.port)
+    await manager.connect(ws, _parse_topics(ws.query_params.get("topics")))
+    logger.info("WebSocket connected successfully. Total connections: %d", len(manager.active))
     try:
         while True:
-            msg = await ws.receive_json()
-            print(f"Received WebSocket message: {msg}")
+            raw = await ws.receive_text()
+            try:
+                msg = orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                logger.debug("Ignoring malformed WebSocket message: %r", raw)
+                continue
+            if not isinstance(msg, dict):
+                logger.debug("Ignoring non-object WebSocket message: %r", raw)
+                continue
+            logger.debug("Received WebSocket message: %s", msg)
             mtype = msg.get("type")
 
             # User finished typing and pressed Enter
             if mtype == "user_message":
                 user_text = (msg.get("text") or "").strip()
-                print(f"Processing user message: '{user_text}'")
+                logger.debug("Processing user message: %r", user_text)
                 if user_text:
                     STATE.last_user_line = user_text
+                    _invalidate_state()
+                    # State subscribers see the new line in their next state frame
+                    await _publish_state()
                     # Tell everyone to update the small line
-                    await manager.broadcast({"type": "user_line", "text": STATE.last_user_line})
+                    await manager.broadcast("chat", {"type": "user_line", "text": STATE.last_user_line})
                     # Show only a blinking cursor in the center until a bot reply arrives
-                    await manager.broadcast({"type": "clear_center"})
+                    await manager.broadcast_raw("chat", _CLEAR_CENTER_FRAME)
 
                     # Process the message through the stateful controller
-                    bot_response = controller.process_message(user_text)
-                    print(f"Bot response: '{bot_response}'")
+                    bot_response, _ = controller.process_message(user_text)
+                    logger.debug("Bot response: %r", bot_response)
 
-                    # Send the bot response after a short delay to simulate thinking
-                    await asyncio.sleep(1.5)
-                    await manager.broadcast({"type": "bot_reply", "text": bot_response})
-                    print(f"Bot reply sent to {len(manager.active)} clients")
+                    # Send the bot response after a short delay to simulate thinking,
+                    # without holding up this client's receive loop
+                    reply = asyncio.create_task(_deliver_reply(1.5, bot_response))
+                    _pending_replies.add(reply)
+                    reply.add_done_callback(_pending_replies.discard)
 
             # A client asks for a fresh copy of the full state
             elif mtype == "request_state":
-                print("State request received")
-                await manager.send_state(ws)
+                logger.debug("State request received")
+                manager.send_state(ws)
             else:
-                print(f"Unknown message type: {mtype}")
+                logger.debug("Unknown message type: %s", mtype)
     except WebSocketDisconnect:
-        print(f"WebSocket disconnected. Total connections: {len(manager.active)}")
+        logger.info("WebSocket disconnected. Total connections: %d", len(manager.active))
         manager.disconnect(ws)
     except Exception as e:
-        print(f"WebSocket error: {e}")
+        logger.warning("WebSocket error: %s", e)
         manager.disconnect(ws)
 
 
@@ -289,12 +490,59 @@ async def get_state():
     return STATE
 
 
+# Bursts of PUTs within this window (seconds) go out as one state broadcast
+STATE_BROADCAST_INTERVAL = 0.05
+
+# Set by update_state, drained by _state_broadcaster; created in lifespan on the server's loop.
+# None when lifespan hasn't run (e.g. mounted as a sub-application), so updates go out directly.
+_state_dirty: Optional[asyncio.Event] = None
+
+
+async def _state_broadcaster():
+    while True:
+        await _state_dirty.wait()
+        await asyncio.sleep(STATE_BROADCAST_INTERVAL)
+        # Cleared after the window so updates landing during it are folded into this send
+        _state_dirty.clear()
+        try:
+            await manager.broadcast_state()
+        except Exception:
+            # Keep the loop alive; otherwise every later PUT would set an event nobody waits on
+            logger.exception("State broadcast failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _state_dirty
+    _state_dirty = asyncio.Event()
+    broadcaster = asyncio.create_task(_state_broadcaster())
+    yield
+    # Back to immediate broadcasts, then stop the broadcaster and any replies still sleeping
+    _state_dirty = None
+    tasks = [broadcaster, *_pending_replies]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+app.router.lifespan_context = lifespan
+
+
+async def _publish_state():
+    """Send STATE to state subscribers: coalesced by the broadcaster, or directly without it."""
+    if _state_dirty is not None:
+        _state_dirty.set()
+    else:
+        await manager.broadcast_state()
+
+
 @app.put("/api/state")
 async def update_state(update: StateUpdate):
-    upd = update.dict(exclude_unset=True)
+    upd = update.model_dump(exclude_unset=True)
     for k, v in upd.items():
         setattr(STATE, k, v)
-    await manager.broadcast({"type": "state", "data": STATE.dict()})
+    _invalidate_state()
+    await _publish_state()
     return {"ok": True}
 
 
@@ -305,18 +553,28 @@ class BotReply(BaseModel):
 @app.post("/api/bot_reply")
 async def bot_reply(payload: BotReply):
     STATE.bot_reply_pending = payload.text
+    _invalidate_state()
     # push a "bot_reply" event; clients type it out
-    await manager.broadcast({"type": "bot_reply", "text": STATE.bot_reply_pending})
+    await manager.broadcast("chat", {"type": "bot_reply", "text": STATE.bot_reply_pending})
     STATE.bot_reply_pending = None
+    _invalidate_state()
     return {"ok": True}
 
 
+def _from_time_ns(ns: int) -> datetime:
+    # Whole seconds through fromtimestamp, microseconds by integer math to avoid float rounding
+    return datetime.fromtimestamp(ns // 1_000_000_000).replace(microsecond=ns // 1000 % 1_000_000)
+
+
 # New endpoints for the stateful controller
 @app.get("/api/controller/history")
 async def get_conversation_history():
     """Get the conversation history from the controller."""
     return {
-        "history": controller.conversation_history,
+        "history": [
+            {**entry, "timestamp": _from_time_ns(entry["timestamp"])}
+            for entry in controller.conversation_history
+        ],
         "total_exchanges": len(controller.conversation_history),
     }
 
@@ -327,19 +585,65 @@ async def get_controller_status():
     return {
         "system_status": controller.system_status,
         "user_preferences": controller.user_preferences,
-        "active_patterns": len(controller.response_patterns),
+        "active_patterns": len(controller.response_patterns) + len(_STATE_TEMPLATES),
     }
 
 
 @app.post("/api/controller/process")
 async def process_message_directly(payload: BotReply):
     """Process a message directly through the controller (for testing)."""
-    response = controller.process_message(payload.text)
-    return {"response": response, "intent": controller.analyze_message(payload.text)}
+    response, analysis = controller.process_message(payload.text)
+    return {"response": response, "intent": analysis}
 
 
 def main():
-    """Run the development server via CLI script."""
+    """Run the server via CLI script (auto-reloading dev server by default)."""
+    import argparse
+    import copy
+
     import uvicorn
+    from uvicorn.config import LOGGING_CONFIG
+
+    parser = argparse.ArgumentParser(prog="start-astrid", description="Run the ASTRID HUD server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--reload",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="restart on code changes (default: on; ignored when --workers > 1)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="worker processes; each keeps its own HUD state and WebSocket clients",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=("debug", "info", "warning", "error"),
+        default="info",
+        help="level for ASTRID's own logs; debug traces every WebSocket message (default: info)",
+    )
+    args = parser.parse_args()
+
+    # uvicorn only configures its own loggers; send ours through the same handler.
+    # Passed as log_config so reload and worker subprocesses apply it too.
+    log_config = copy.deepcopy(LOGGING_CONFIG)
+    log_config["loggers"]["astrid"] = {
+        "handlers": ["default"],
+        "level": args.log_level.upper(),
+        "propagate": False,
+    }
 
-    uvicorn.run("astrid.main:app", host="127.0.0.1", port=8000, reload=True)
+    # loop/http/ws stay on "auto": with uvicorn[standard] installed that already
+    # resolves to uvloop, httptools and websockets, and falls back cleanly where
+    # uvloop is unavailable (Windows)
+    uvicorn.run(
+        "astrid.main:app",
+        host=args.host,
+        port=args.port,
+        reload=args.reload and args.workers == 1,
+        workers=args.workers,
+        log_config=log_config,
+    )
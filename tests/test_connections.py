@@ -0,0 +1,97 @@
+import asyncio
+import json
+import unittest
+
+from astrid.main import CLIENT_QUEUE_SIZE, ConnectionManager
+
+
+class FakeSocket:
+    """Records sent frames; ``gate`` blocks sends until set, ``fail`` makes them raise."""
+
+    def __init__(self, stalled=False, fail=False):
+        self.sent = []
+        self.fail = fail
+        self.gate = asyncio.Event()
+        if not stalled:
+            self.gate.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("connection lost")
+        await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class ConnectionManagerTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.manager = ConnectionManager()
+
+    async def asyncTearDown(self):
+        for ws in list(self.manager.active):
+            self.manager.disconnect(ws)
+
+    def reply(self, n):
+        return self.manager.broadcast("chat", {"type": "bot_reply", "text": str(n)})
+
+    async def test_slow_client_does_not_block_others(self):
+        slow, healthy = FakeSocket(stalled=True), FakeSocket()
+        await self.manager.connect(slow)
+        await self.manager.connect(healthy)
+
+        for n in range(3):
+            await self.reply(n)
+            await settle()
+
+        self.assertEqual([f["type"] for f in healthy.sent], ["state", "bot_reply", "bot_reply", "bot_reply"])
+        self.assertEqual(slow.sent, [])
+
+    async def test_full_queue_skips_chat_frames_and_keeps_state(self):
+        slow = FakeSocket(stalled=True)
+        await self.manager.connect(slow, ["chat", "state"])
+        await settle()  # writer picks up the connect-time state frame and stalls on it
+
+        with self.assertLogs("astrid", "WARNING") as logs:
+            for n in range(CLIENT_QUEUE_SIZE + 2):
+                await self.reply(n)
+        self.assertEqual(len(logs.records), 2)
+
+        await self.manager.broadcast_state()
+        slow.gate.set()
+        await settle()
+
+        replies = [f["text"] for f in slow.sent if f["type"] == "bot_reply"]
+        self.assertEqual(replies, [str(n) for n in range(CLIENT_QUEUE_SIZE)])
+        self.assertEqual([f["type"] for f in slow.sent].count("state"), 2)
+
+    async def test_pending_state_updates_collapse_into_one_send(self):
+        slow = FakeSocket(stalled=True)
+        await self.manager.connect(slow, ["state"])
+        await settle()
+
+        for _ in range(5):
+            await self.manager.broadcast_state()
+        slow.gate.set()
+        await settle()
+
+        self.assertEqual([f["type"] for f in slow.sent], ["state", "state"])
+
+    async def test_failed_send_disconnects_client(self):
+        dead = FakeSocket(fail=True)
+        with self.assertLogs("astrid", "WARNING"):
+            await self.manager.connect(dead)
+            await settle()
+
+        self.assertNotIn(dead, self.manager.active)
+        self.assertNotIn(dead, self.manager.subscribers["state"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from astrid.main import app, controller
+
+
+class AnalyzeMessageTests(unittest.TestCase):
+    def intent(self, message):
+        return controller.analyze_message(message)["intent"]
+
+    def test_keywords_match_case_insensitively(self):
+        self.assertEqual(self.intent("STATUS"), "status")
+        self.assertEqual(self.intent("Battery?"), "battery")
+
+    def test_highest_priority_intent_wins(self):
+        self.assertEqual(self.intent("hello, what is my battery at"), "greeting")
+
+    def test_keywords_must_start_a_word(self):
+        self.assertEqual(self.intent("this"), "unknown")
+        # Non-ASCII letters are word characters too, so these don't start a keyword
+        self.assertEqual(self.intent("éhi"), "unknown")
+        self.assertEqual(self.intent("søhow"), "unknown")
+        self.assertEqual(self.intent("watts"), "power")
+
+    def test_non_ascii_case_variants_do_not_match(self):
+        # Unicode case folding would match these and then fail the keyword lookup
+        for message in ("ſtatus", "İnspect", "hı"):
+            with self.subTest(message=message):
+                self.assertEqual(self.intent(message), "unknown")
+
+    def test_process_endpoint_handles_non_ascii_input(self):
+        response = TestClient(app).post("/api/controller/process", json={"text": "ſtatus"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["intent"]["intent"], "unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
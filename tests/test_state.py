@@ -0,0 +1,60 @@
+import time
+import unittest
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from astrid import main
+from astrid.main import STATE, app
+
+
+class StateBroadcastTests(unittest.TestCase):
+    def setUp(self):
+        saved = STATE.model_dump()
+        self.addCleanup(lambda: [setattr(STATE, k, v) for k, v in saved.items()])
+        self.addCleanup(main._invalidate_state)
+
+    def test_burst_of_puts_is_coalesced_into_one_frame(self):
+        # A wide window so the whole burst lands inside it
+        with mock.patch.object(main, "STATE_BROADCAST_INTERVAL", 0.5), TestClient(app) as client:
+            with client.websocket_connect("/ws?topics=state") as ws:
+                ws.receive_json()  # state sent on connect
+
+                for load_w in range(20):
+                    self.assertEqual(client.put("/api/state", json={"load_w": load_w}).status_code, 200)
+                frame = ws.receive_json()
+                self.assertEqual(frame["type"], "state")
+                self.assertEqual(frame["data"]["load_w"], 19)
+
+                # The next frame belongs to the next PUT, so the burst produced only one
+                client.put("/api/state", json={"load_w": 999})
+                self.assertEqual(ws.receive_json()["data"]["load_w"], 999)
+
+    def test_broadcaster_survives_a_failed_broadcast(self):
+        real = main.manager.broadcast_state
+        calls = []
+
+        async def flaky():
+            calls.append(None)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            await real()
+
+        with TestClient(app) as client, client.websocket_connect("/ws?topics=state") as ws:
+            ws.receive_json()
+            with mock.patch.object(main.manager, "broadcast_state", flaky):
+                with self.assertLogs("astrid", "ERROR"):
+                    client.put("/api/state", json={"load_w": 1})
+                    while not calls:
+                        time.sleep(0.01)
+                client.put("/api/state", json={"load_w": 2})
+                self.assertEqual(ws.receive_json()["data"]["load_w"], 2)
+
+    def test_put_without_lifespan_broadcasts_directly(self):
+        response = TestClient(app).put("/api/state", json={"battery_pct": 12})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(STATE.battery_pct, 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from fastapi.testclient import TestClient
+
+from astrid import main
+from astrid.main import STATE, app, manager
+
+
+def receive_until(ws, done):
+    """Collect frames up to and including the first one ``done`` accepts."""
+    frames = []
+    while True:
+        frames.append(ws.receive_json())
+        if done(frames[-1]):
+            return frames
+
+
+class WebSocketEndpointTests(unittest.TestCase):
+    def setUp(self):
+        saved = STATE.model_dump()
+        self.addCleanup(lambda: [setattr(STATE, k, v) for k, v in saved.items()])
+        self.addCleanup(main._invalidate_state)
+
+    def test_invalid_frames_are_ignored_without_dropping_the_client(self):
+        with TestClient(app) as client, client.websocket_connect("/ws") as ws:
+            self.assertEqual(ws.receive_json()["type"], "state")
+            for frame in ("{not json", "[1]", "null", '"text"', "42"):
+                ws.send_text(frame)
+            ws.send_json({"type": "request_state"})
+
+            self.assertEqual(ws.receive_json()["type"], "state")
+            self.assertEqual(len(manager.active), 1)
+
+    def test_chat_subscriber_never_gets_state_frames(self):
+        with TestClient(app) as client, client.websocket_connect("/ws?topics=chat") as ws:
+            client.put("/api/state", json={"load_w": 1})
+            client.post("/api/bot_reply", json={"text": "first"})
+            client.put("/api/state", json={"load_w": 2})
+            client.post("/api/bot_reply", json={"text": "last"})
+
+            frames = receive_until(ws, lambda f: f.get("text") == "last")
+            self.assertEqual([f["type"] for f in frames], ["bot_reply", "bot_reply"])
+
+    def test_state_subscriber_never_gets_chat_frames(self):
+        with TestClient(app) as client, client.websocket_connect("/ws?topics=state") as ws:
+            ws.receive_json()  # state sent on connect
+            client.post("/api/bot_reply", json={"text": "ignored"})
+            client.put("/api/state", json={"load_w": 4321})
+
+            frames = receive_until(ws, lambda f: f["data"]["load_w"] == 4321)
+            self.assertEqual({f["type"] for f in frames}, {"state"})
+
+    def test_state_subscriber_sees_new_user_line(self):
+        with TestClient(app) as client, client.websocket_connect("/ws?topics=state") as ws:
+            ws.receive_json()
+            with client.websocket_connect("/ws?topics=chat") as sender:
+                sender.send_json({"type": "user_message", "text": "how is the battery"})
+
+                frames = receive_until(ws, lambda f: f["data"]["last_user_line"] == "how is the battery")
+                self.assertEqual({f["type"] for f in frames}, {"state"})
+
+
+if __name__ == "__main__":
+    unittest.main()